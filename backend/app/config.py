@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 
@@ -7,26 +8,51 @@ class Settings(BaseSettings):
     gemini_api_key: str
     github_token: Optional[str] = None
     
+    # Uploads
+    max_upload_bytes: int = 50 * 1024 * 1024
+    
     # Database
     vector_db_path: str = "./vector_db"
+    emb_cache_path: str = "./emb_cache"
     
     # API Settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     debug: bool = True
+    # Chat history, the current analysis and indexed repositories live in
+    # process memory, so app.main refuses anything but a single worker
+    workers: int = 1
     
     # CORS
     cors_origins: list = ["http://localhost:5173", "http://localhost:3000"]
+    cors_max_age: int = 86400  # seconds browsers may cache preflight responses
+    
+    # Chat
+    chat_history_max: int = 500
     
     # LangChain Settings
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    config_chunk_size: int = 2000  # YAML/JSON chunks
     max_tokens: int = 4000
     temperature: float = 0.7
+    embedding_batch_size: int = 64
+    embedding_max_seq_length: int = 256  # tokens per chunk seen by the embedding model
+    embedding_backend: str = "huggingface"  # or "onnx" (needs fastembed)
+    max_file_bytes: int = 512 * 1024  # larger repository files are not indexed
+    repo_cache_size: int = 8  # analyzed repositories kept indexed and ready to chat
     
     class Config:
         env_file = ".env"
         case_sensitive = False
 
-# Global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache
+def get_settings() -> Settings:
+    """Parse settings once per process.
+
+    Settings are read when the app is imported (middleware, chat history size,
+    LangChainService), not per request, so app.dependency_overrides has no
+    effect; set env vars and call get_settings.cache_clear() before importing
+    the app instead.
+    """
+    return Settings()
\ No newline at end of file
@@ -1,23 +1,53 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+import orjson
 import uvicorn
 
-from .config import settings
+from .config import get_settings
 from .routers import chat, repository, suggestions
+from .services.langchain_service import langchain_service
+from .utils.cors import FastCORSMiddleware
+from .utils.upload_limit import UploadLimitMiddleware
+
+settings = get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Repository collections from a previous run are never evicted otherwise
+    await asyncio.to_thread(langchain_service.prune_collections)
+    yield
 
 app = FastAPI(
     title="DevOps GPT API", 
     version="1.0.0",
-    description="AI-powered DevOps assistant with repository analysis and suggestions"
+    description="AI-powered DevOps assistant with repository analysis and suggestions",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Shared repository analysis, written by the repository router and read by suggestions
+app.state.current_analysis = None
+app.state.analysis_lock = asyncio.Lock()
+
+# Upload size limit, checked before the multipart body is read; added
+# first so CORS headers still wrap its 413/400 responses
+app.add_middleware(
+    UploadLimitMiddleware,
+    paths=["/repository/upload"],
+    max_bytes=settings.max_upload_bytes,
 )
 
 # CORS middleware
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    FastCORSMiddleware,
+    origins=settings.cors_origins,
+    methods=["*"],
+    headers=["*"],
+    credentials=True,
+    max_age=settings.cors_max_age,
 )
 
 # Include routers
@@ -25,24 +55,32 @@ app.include_router(chat.router)
 app.include_router(repository.router)
 app.include_router(suggestions.router)
 
-# Health endpoints
+# Health endpoints, bodies are static so encode them once
+_ROOT = orjson.dumps({
+    "message": "DevOps GPT API is running",
+    "version": "1.0.0",
+    "docs": "/docs"
+})
+_HEALTH = orjson.dumps({"status": "healthy", "service": "devops-gpt-api"})
+
 @app.get("/")
 async def root():
-    return {
-        "message": "DevOps GPT API is running",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "devops-gpt-api"}
+    return Response(content=_HEALTH, media_type="application/json")
 
 
 if __name__ == "__main__":
+    if settings.workers != 1:
+        # Chat history, the current analysis and the repository cache are per
+        # process, and startup prunes the shared vector DB
+        raise SystemExit("WORKERS must be 1: server state is kept in process memory")
     uvicorn.run(
         "app.main:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=settings.debug
+        reload=settings.debug,
+        workers=settings.workers
     )
\ No newline at end of file
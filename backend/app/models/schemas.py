@@ -43,7 +43,7 @@ class RepositoryAnalysis(BaseModel):
     repository_url: str
     files_analyzed: List[str]
     analysis: Dict[str, List[str]]
-    files_details: List[FileAnalysis]
+    files_details: List[FileAnalysis] = []
     summary: str
 
 # Suggestion Models
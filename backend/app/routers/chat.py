@@ -1,38 +1,50 @@
 from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import Deque, List
+from collections import deque
+import os
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
+from ..config import get_settings
 from ..models.schemas import ChatMessageRequest, ChatMessageResponse, MessageSender
 from ..services.langchain_service import langchain_service
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-# In-memory storage (replace with DB later)
-chat_history: List[ChatMessageResponse] = []
+_UTC = timezone.utc
+
+def _now() -> datetime:
+    """Current time as an aware UTC datetime, without a local timezone lookup"""
+    return datetime.fromtimestamp(time.time(), tz=_UTC)
+
+def _message(id_bytes: bytes, text: str, sender: MessageSender) -> ChatMessageResponse:
+    """Build a server-generated message without re-validating it"""
+    return ChatMessageResponse.model_construct(
+        id=str(uuid.UUID(bytes=id_bytes, version=4)),
+        text=text,
+        sender=sender,
+        timestamp=_now()
+    )
+
+# In-memory storage (replace with DB later), oldest messages are evicted first
+chat_history: Deque[ChatMessageResponse] = deque(maxlen=get_settings().chat_history_max)
 
 @router.post("", response_model=ChatMessageResponse)
 async def send_message(message: ChatMessageRequest):
     try:
+        # One urandom read for both message ids
+        raw = os.urandom(32)
+        
         # Add user message to history
-        user_msg = ChatMessageResponse(
-            id=str(uuid.uuid4()),
-            text=message.message,
-            sender=MessageSender.USER,
-            timestamp=datetime.now()
-        )
-        chat_history.append(user_msg)
+        chat_history.append(_message(raw[:16], message.message, MessageSender.USER))
         
         # Get AI response
         bot_response = await langchain_service.chat(message.message)
         
         # Add bot message to history
-        bot_msg = ChatMessageResponse(
-            id=str(uuid.uuid4()),
-            text=bot_response,
-            sender=MessageSender.BOT,
-            timestamp=datetime.now()
-        )
+        bot_msg = _message(raw[16:], bot_response, MessageSender.BOT)
         chat_history.append(bot_msg)
         
         return bot_msg
@@ -40,12 +52,27 @@ async def send_message(message: ChatMessageRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
+@router.post("/stream")
+async def stream_message(message: ChatMessageRequest):
+    """Send a message and stream the answer back as plain text tokens"""
+    raw = os.urandom(32)
+    chat_history.append(_message(raw[:16], message.message, MessageSender.USER))
+    
+    async def tokens():
+        parts = []
+        async for token in langchain_service.chat_stream(message.message):
+            parts.append(token)
+            yield token
+        # Store the full answer once the stream has finished
+        chat_history.append(_message(raw[16:], "".join(parts), MessageSender.BOT))
+    
+    return StreamingResponse(tokens(), media_type="text/plain")
+
 @router.get("/history", response_model=List[ChatMessageResponse])
 async def get_chat_history():
-    return chat_history
+    return list(chat_history)
 
 @router.delete("/history")
 async def clear_chat_history():
-    global chat_history
     chat_history.clear()
     return {"message": "Chat history cleared"}
\ No newline at end of file
@@ -1,39 +1,51 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File
 from typing import List
+import asyncio
 import tempfile
 import os
+import aiofiles
 
 from ..models.schemas import RepositoryRequest, RepositoryAnalysis
 from ..services.langchain_service import langchain_service
 
 router = APIRouter(prefix="/repository", tags=["repository"])
 
-# Store current analysis
-current_analysis: RepositoryAnalysis = None
+UPLOAD_CHUNK_SIZE = 1 << 16  # 64KB
+
+async def _save(file: UploadFile, temp_dir: str):
+    """Stream one upload to disk in fixed-size chunks to keep memory flat"""
+    # Total request size is capped by UploadLimitMiddleware before parsing
+    file_path = os.path.join(temp_dir, file.filename)
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
 
 @router.post("/analyze", response_model=RepositoryAnalysis)
-async def analyze_repository(request: RepositoryRequest):
+async def analyze_repository(repo_request: RepositoryRequest, request: Request):
     try:
-        result = await langchain_service.analyze_repository(str(request.repository_url))
+        result = await langchain_service.analyze_repository(str(repo_request.repository_url))
         
-        global current_analysis
-        current_analysis = RepositoryAnalysis(**result)
+        analysis = RepositoryAnalysis.model_construct(**result)
+        async with request.app.state.analysis_lock:
+            request.app.state.current_analysis = analysis
         
-        return current_analysis
+        return analysis
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Repository analysis failed: {str(e)}")
 
 @router.post("/upload", response_model=RepositoryAnalysis)
-async def upload_files(files: List[UploadFile] = File(...)):
+async def upload_files(request: Request, files: List[UploadFile] = File(...)):
     try:
         with tempfile.TemporaryDirectory() as temp_dir:
-            # Save uploaded files
-            for file in files:
-                file_path = os.path.join(temp_dir, file.filename)
-                with open(file_path, "wb") as f:
-                    content = await file.read()
-                    f.write(content)
+            # Save uploaded files concurrently; if one write fails the rest are
+            # cancelled and awaited before the temp dir is removed
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for file in files:
+                        tg.create_task(_save(file, temp_dir))
+            except ExceptionGroup as e:
+                raise e.exceptions[0]
             
             # Analyze uploaded files (simplified version)
             # In a real implementation, you'd process these files similar to repository analysis
@@ -49,16 +61,18 @@ async def upload_files(files: List[UploadFile] = File(...)):
                 "summary": f"Analyzed {len(files)} uploaded files"
             }
             
-            global current_analysis
-            current_analysis = RepositoryAnalysis(**analysis_result)
+            analysis = RepositoryAnalysis.model_construct(**analysis_result)
+            async with request.app.state.analysis_lock:
+                request.app.state.current_analysis = analysis
             
-            return current_analysis
+            return analysis
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File upload analysis failed: {str(e)}")
 
 @router.get("/current", response_model=RepositoryAnalysis)
-async def get_current_analysis():
+async def get_current_analysis(request: Request):
+    current_analysis = request.app.state.current_analysis
     if not current_analysis:
         raise HTTPException(status_code=404, detail="No repository analysis available")
     return current_analysis
\ No newline at end of file
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from functools import lru_cache
 from typing import List
+import orjson
 
 from ..models.schemas import (
     Suggestion, SuggestionType, Priority,
@@ -8,59 +10,30 @@ from ..models.schemas import (
 
 router = APIRouter(prefix="/suggestions", tags=["suggestions"])
 
-# Import current analysis from repository router
-from .repository import current_analysis
+# Analysis key -> (suggestion type, title, priority)
+_CATEGORIES = [
+    ("dockerfile_suggestions", SuggestionType.DOCKERFILE, "Dockerfile Optimization", Priority.MEDIUM),
+    ("kubernetes_suggestions", SuggestionType.KUBERNETES, "Kubernetes Configuration", Priority.HIGH),
+    ("cicd_suggestions", SuggestionType.CICD, "CI/CD Pipeline", Priority.MEDIUM),
+    ("monitoring_suggestions", SuggestionType.MONITORING, "Monitoring & Observability", Priority.LOW),
+]
 
 @router.get("", response_model=List[Suggestion])
-async def get_suggestions():
+async def get_suggestions(request: Request):
+    current_analysis = request.app.state.current_analysis
     if not current_analysis:
         return []
     
-    suggestions = []
-    
-    # Convert analysis to structured suggestions
-    for suggestion_text in current_analysis.analysis.get("dockerfile_suggestions", []):
-        suggestions.append(Suggestion(
-            type=SuggestionType.DOCKERFILE,
-            title="Dockerfile Optimization",
-            description=suggestion_text,
-            priority=Priority.MEDIUM
-        ))
-    
-    for suggestion_text in current_analysis.analysis.get("kubernetes_suggestions", []):
-        suggestions.append(Suggestion(
-            type=SuggestionType.KUBERNETES,
-            title="Kubernetes Configuration",
-            description=suggestion_text,
-            priority=Priority.HIGH
-        ))
-    
-    for suggestion_text in current_analysis.analysis.get("cicd_suggestions", []):
-        suggestions.append(Suggestion(
-            type=SuggestionType.CICD,
-            title="CI/CD Pipeline",
-            description=suggestion_text,
-            priority=Priority.MEDIUM
-        ))
-    
-    for suggestion_text in current_analysis.analysis.get("monitoring_suggestions", []):
-        suggestions.append(Suggestion(
-            type=SuggestionType.MONITORING,
-            title="Monitoring & Observability",
-            description=suggestion_text,
-            priority=Priority.LOW
-        ))
-    
-    return suggestions
+    # Enum values are known-valid, so skip per-item validation
+    return [
+        Suggestion.model_construct(type=type_, title=title, description=description, priority=priority)
+        for key, type_, title, priority in _CATEGORIES
+        for description in current_analysis.analysis.get(key, ())
+    ]
 
-@router.post("/generate-tests", response_model=GenerationResponse)
-async def generate_test_scripts(request: TestGenerationRequest):
-    try:
-        test_type = request.type.lower()
-        
-        templates = {
-            "selenium": {
-                "content": '''from selenium import webdriver
+_TEST_TEMPLATES = {
+    "selenium": {
+        "content": '''from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -91,12 +64,12 @@ class DevOpsGPTUITests(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()''',
-                "filename": "test_ui_selenium.py",
-                "description": "Selenium UI tests for DevOps GPT frontend"
-            },
-            
-            "pytest": {
-                "content": '''import pytest
+        "filename": "test_ui_selenium.py",
+        "description": "Selenium UI tests for DevOps GPT frontend"
+    },
+    
+    "pytest": {
+        "content": '''import pytest
 import requests
 import json
 
@@ -132,12 +105,12 @@ def test_suggestions_endpoint(api_client):
     response = api_client.get(f"{BASE_URL}/suggestions")
     assert response.status_code == 200
     assert isinstance(response.json(), list)''',
-                "filename": "test_api_pytest.py",
-                "description": "Pytest API tests for DevOps GPT backend"
-            },
-            
-            "testng": {
-                "content": '''package com.devopsgpt.tests;
+        "filename": "test_api_pytest.py",
+        "description": "Pytest API tests for DevOps GPT backend"
+    },
+    
+    "testng": {
+        "content": '''package com.devopsgpt.tests;
 
 import org.testng.annotations.Test;
 import org.testng.annotations.BeforeClass;
@@ -181,27 +154,14 @@ public class DevOpsGPTApiTests {
         Assert.assertEquals(response.getStatusCode(), 200);
     }
 }''',
-                "filename": "DevOpsGPTApiTests.java",
-                "description": "TestNG API tests for DevOps GPT backend"
-            }
-        }
-        
-        if test_type not in templates:
-            raise HTTPException(status_code=400, detail=f"Unsupported test type: {test_type}")
-        
-        return GenerationResponse(**templates[test_type])
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Test generation failed: {str(e)}")
+        "filename": "DevOpsGPTApiTests.java",
+        "description": "TestNG API tests for DevOps GPT backend"
+    }
+}
 
-@router.post("/generate-monitoring", response_model=GenerationResponse)
-async def generate_monitoring_config(request: MonitoringGenerationRequest):
-    try:
-        config_type = request.type.lower()
-        
-        templates = {
-            "prometheus": {
-                "content": '''global:
+_MONITORING_TEMPLATES = {
+    "prometheus": {
+        "content": '''global:
   scrape_interval: 15s
   evaluation_interval: 15s
 
@@ -226,12 +186,12 @@ alerting:
     - static_configs:
         - targets:
           - alertmanager:9093''',
-                "filename": "prometheus.yml",
-                "description": "Prometheus configuration for DevOps GPT monitoring"
-            },
-            
-            "grafana": {
-                "content": '''{
+        "filename": "prometheus.yml",
+        "description": "Prometheus configuration for DevOps GPT monitoring"
+    },
+    
+    "grafana": {
+        "content": '''{
   "dashboard": {
     "id": null,
     "title": "DevOps GPT Dashboard",
@@ -284,15 +244,37 @@ alerting:
     ]
   }
 }''',
-                "filename": "devops_gpt_dashboard.json",
-                "description": "Grafana dashboard for DevOps GPT metrics"
-            }
-        }
-        
-        if config_type not in templates:
-            raise HTTPException(status_code=400, detail=f"Unsupported monitoring type: {config_type}")
-        
-        return GenerationResponse(**templates[config_type])
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Monitoring config generation failed: {str(e)}")
\ No newline at end of file
+        "filename": "devops_gpt_dashboard.json",
+        "description": "Grafana dashboard for DevOps GPT metrics"
+    }
+}
+
+_TEMPLATES = {
+    "tests": _TEST_TEMPLATES,
+    "monitoring": _MONITORING_TEMPLATES,
+}
+
+@lru_cache(maxsize=8)
+def _template_response(category: str, kind: str) -> Response:
+    """Encode a static template once, on first request, and reuse the Response"""
+    template = GenerationResponse(**_TEMPLATES[category][kind])
+    return Response(content=orjson.dumps(template.model_dump()), media_type="application/json")
+
+@router.post("/generate-tests", response_model=GenerationResponse)
+async def generate_test_scripts(request: TestGenerationRequest):
+    test_type = request.type.lower()
+    
+    # Validate before the cache so unknown types can't evict real entries
+    if test_type not in _TEST_TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unsupported test type: {test_type}")
+    
+    return _template_response("tests", test_type)
+
+@router.post("/generate-monitoring", response_model=GenerationResponse)
+async def generate_monitoring_config(request: MonitoringGenerationRequest):
+    config_type = request.type.lower()
+    
+    if config_type not in _MONITORING_TEMPLATES:
+        raise HTTPException(status_code=400, detail=f"Unsupported monitoring type: {config_type}")
+    
+    return _template_response("monitoring", config_type)
\ No newline at end of file
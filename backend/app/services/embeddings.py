@@ -0,0 +1,30 @@
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+MINILM_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+class ONNXMiniLMEmbeddings(Embeddings):
+    """all-MiniLM-L6-v2 served through ONNX Runtime via fastembed.
+
+    Produces 384-dim vectors equivalent to the HuggingFace/PyTorch model, but
+    runs on ONNX Runtime's fused CPU kernels without importing torch.
+    Requires ``pip install fastembed``.
+    """
+
+    def __init__(self, model_name: str = MINILM_MODEL, batch_size: int = 64):
+        try:
+            from fastembed import TextEmbedding
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_BACKEND=onnx requires fastembed: pip install fastembed"
+            ) from e
+
+        self.model = TextEmbedding(model_name=model_name)
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [vector.tolist() for vector in self.model.embed(texts, batch_size=self.batch_size)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
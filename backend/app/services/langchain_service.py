@@ -1,50 +1,356 @@
+import asyncio
+import hashlib
+import mmap
 import os
 import tempfile
 import shutil
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Set, Tuple
+import ahocorasick
+from cachetools import LRUCache
+from langchain_core.embeddings import Embeddings
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain.text_splitter import Language, RecursiveCharacterTextSplitter, TextSplitter
 from langchain.docstore.document import Document
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
-from git import Repo
+from langchain.chains import ConversationalRetrievalChain, LLMChain
+from langchain.memory import ConversationSummaryBufferMemory
+from langchain.callbacks.streaming_aiter import AsyncIteratorCallbackHandler
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.messages import BaseMessage, get_buffer_string
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from git import Git, GitCommandError, Repo
+import chromadb
+from chromadb.config import Settings as ChromaSettings
 import google.generativeai as genai
-from ..config import settings
+from ..config import Settings, get_settings
+from .embeddings import MINILM_MODEL, ONNXMiniLMEmbeddings
+
+# Cosine matches how MiniLM was trained; larger M/ef trade build time for recall
+COLLECTION_PREFIX = "repo_"
+HNSW_PARAMS = {"hnsw:space": "cosine", "hnsw:construction_ef": 200, "hnsw:M": 32}
+# Stay well under Chroma's per-call batch limit
+CHROMA_BATCH_SIZE = 5000
+BINARY_SNIFF_BYTES = 4096
+# Files above this are decoded straight from a memory map
+MMAP_THRESHOLD_BYTES = 64 * 1024
+GPU_EMBEDDING_BATCH_SIZE = 128
+# Rough English/code average, used to size chat memory without calling the API
+CHARS_PER_TOKEN = 4
+
+def _keyword_automaton(keywords: List[str]) -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+def _find_keywords(automaton: ahocorasick.Automaton, content: str) -> Set[str]:
+    """Collect which keywords occur in content with a single scan"""
+    hits = set()
+    for _, keyword in automaton.iter(content):
+        hits.add(keyword)
+        if len(hits) == len(automaton):
+            break
+    return hits
+
+# Keywords checked by the config analyzers, matched against lowercased content
+_DOCKERFILE_KEYWORDS = _keyword_automaton(["healthcheck", "user", "multi-stage", "from", ".dockerignore"])
+_KUBERNETES_KEYWORDS = _keyword_automaton(["resources:", "livenessprobe", "readinessprobe", "securitycontext"])
+_CICD_KEYWORDS = _keyword_automaton(["cache", "test", "security", "scan", "artifact"])
+
+def _file_kinds(relative_path: str) -> str:
+    """Comma-separated analyzer buckets a file belongs to (Chroma metadata must be scalar)"""
+    kinds = []
+    if "dockerfile" in relative_path.lower():
+        kinds.append("dockerfile")
+    if relative_path.endswith(('.yaml', '.yml')):
+        kinds.append("k8s")
+    if ".github" in relative_path:
+        kinds.append("ci")
+    return ",".join(kinds)
+
+def _estimate_tokens(message: BaseMessage) -> int:
+    """Rough token count for memory pruning, without a tokenizer round trip"""
+    return len(get_buffer_string([message])) // CHARS_PER_TOKEN + 1
+
+def _collection_name(repo_url: str) -> str:
+    """Chroma collection holding one repository's chunks"""
+    return COLLECTION_PREFIX + hashlib.sha1(repo_url.encode()).hexdigest()[:16]
+
+def _remote_head(repo_url: str) -> Optional[str]:
+    """Commit sha the remote's HEAD points at, or None if it can't be read"""
+    try:
+        output = Git().ls_remote(repo_url, "HEAD")
+    except GitCommandError:
+        return None
+    return output.split()[0] if output else None
+
+class _RepositoryCache(LRUCache):
+    """LRU of analyzed repositories that calls on_evict with each dropped collection name"""
+
+    def __init__(self, maxsize: int, on_evict: Callable[[str], None]):
+        super().__init__(maxsize)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._on_evict(key)
+        return key, value
+
+class _StreamingChatGoogleGenerativeAI(ChatGoogleGenerativeAI):
+    """Gemini chat model that always generates through its streaming API.
+
+    ChatGoogleGenerativeAI has no ``streaming`` flag, so chains awaiting it
+    never see on_llm_new_token; building the result from _astream makes each
+    chunk reach the callbacks as it arrives.
+    """
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        generation: Optional[ChatGenerationChunk] = None
+        async for chunk in self._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            generation = chunk if generation is None else generation + chunk
+        if generation is None:
+            raise ValueError("No generations found in stream.")
+        return ChatResult(generations=[generation])
+
+class _SummaryBufferMemory(ConversationSummaryBufferMemory):
+    """Summary buffer memory that never blocks the event loop.
+
+    Chain.ainvoke saves context synchronously, so pruning estimates tokens
+    locally instead of making one count_tokens request per message, and the
+    pruned turns are summarized in a background task on the async LLM API.
+    """
+
+    # Turns pruned from the buffer but not yet folded into the summary
+    pending_messages: List[BaseMessage] = []
+    summary_task: Optional[asyncio.Task] = None
+
+    @property
+    def buffer(self) -> List[BaseMessage]:
+        return self.pending_messages + self.chat_memory.messages
+
+    def prune(self) -> None:
+        buffer = self.chat_memory.messages
+        lengths = [_estimate_tokens(message) for message in buffer]
+        curr_buffer_length = sum(lengths)
+        if curr_buffer_length <= self.max_token_limit:
+            return
+        
+        pruned = 0
+        while curr_buffer_length > self.max_token_limit:
+            curr_buffer_length -= lengths[pruned]
+            pruned += 1
+        self.pending_messages = self.pending_messages + buffer[:pruned]
+        del buffer[:pruned]
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous caller, nothing to block
+            self.moving_summary_buffer = self.predict_new_summary(
+                self.pending_messages, self.moving_summary_buffer
+            )
+            self.pending_messages = []
+            return
+        if self.summary_task is None or self.summary_task.done():
+            self.summary_task = asyncio.create_task(self._summarize_pending())
+
+    async def _summarize_pending(self) -> None:
+        # Turns pruned while a summary is in flight are picked up by the next loop
+        while self.pending_messages:
+            messages = self.pending_messages
+            new_lines = get_buffer_string(messages, human_prefix=self.human_prefix, ai_prefix=self.ai_prefix)
+            try:
+                summary = await LLMChain(llm=self.llm, prompt=self.prompt).apredict(
+                    summary=self.moving_summary_buffer, new_lines=new_lines
+                )
+            except Exception:
+                # Keep the turns in the buffer; the next prune retries
+                return
+            self.moving_summary_buffer = summary
+            self.pending_messages = self.pending_messages[len(messages):]
+
+    def clear(self) -> None:
+        if self.summary_task is not None:
+            self.summary_task.cancel()
+            self.summary_task = None
+        self.pending_messages = []
+        super().clear()
+
+class _AnswerStreamHandler(AsyncIteratorCallbackHandler):
+    """Token queue that stays open across LLM runs; the caller marks it done"""
+
+    async def on_llm_end(self, response, **kwargs: Any) -> None:
+        pass
+
+    async def on_llm_error(self, error: BaseException, **kwargs: Any) -> None:
+        pass
 
 class LangChainService:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+    # Files to include: *.py, *.js, ..., *.Dockerfile, Dockerfile*, docker-compose*, *.env*
+    _SUFFIXES = (
+        ".py", ".js", ".ts", ".jsx", ".tsx",
+        ".yaml", ".yml", ".json", ".md",
+        ".tf", ".sh", ".env",
+        ".Dockerfile", ".dockerfile"
+    )
+    _PREFIXES = ("Dockerfile", "docker-compose", ".env")
+    # Matched anywhere in the name, e.g. prod.env.local
+    _INFIXES = (".env.",)
+    _SKIP_DIRS = frozenset(["node_modules", "__pycache__", "venv"])
+    
+    def __init__(self, settings: Optional[Settings] = None):
+        # Models and clients below are cached properties, built on first use so
+        # importing the app (and forking workers) stays cheap
+        self.settings = settings or get_settings()
+        self.vector_store = None
+        self.qa_chain = None
+        # collection name -> (vector_store, qa_chain, result, head sha) for recently analyzed repositories
+        self._repositories = _RepositoryCache(self.settings.repo_cache_size, self._drop_collection)
+
+    @cached_property
+    def llm(self) -> ChatGoogleGenerativeAI:
+        return _StreamingChatGoogleGenerativeAI(
             model="gemini-pro",
-            google_api_key=settings.gemini_api_key,
-            temperature=settings.temperature,
-            max_tokens=settings.max_tokens
+            google_api_key=self.settings.gemini_api_key,
+            temperature=self.settings.temperature,
+            max_tokens=self.settings.max_tokens
         )
-        
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
+
+    @cached_property
+    def question_llm(self) -> ChatGoogleGenerativeAI:
+        # Non-streaming model for condensing follow-up questions, so only
+        # answer tokens reach chat_stream()
+        return ChatGoogleGenerativeAI(
+            model="gemini-pro",
+            google_api_key=self.settings.gemini_api_key,
+            temperature=self.settings.temperature,
+            max_tokens=self.settings.max_tokens
         )
+
+    @cached_property
+    def base_embeddings(self) -> Embeddings:
+        if self.settings.embedding_backend == "onnx":
+            return ONNXMiniLMEmbeddings(batch_size=self.settings.embedding_batch_size)
+        
+        import torch
         
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.chunk_size,
-            chunk_overlap=settings.chunk_overlap,
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        if device == "cpu":
+            # Give intra-op matmuls every core but one, leaving room for the event loop
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) - 1))
+            try:
+                torch.set_num_interop_threads(2)
+            except RuntimeError:
+                # Only settable before torch runs its first parallel op
+                pass
+        # GPUs stay saturated with larger batches than CPUs
+        batch_size = GPU_EMBEDDING_BATCH_SIZE if device == "cuda" else self.settings.embedding_batch_size
+        
+        # embed_documents encodes all chunks in one SentenceTransformer.encode
+        # call, which already length-sorts internally to minimise padding
+        embeddings = HuggingFaceEmbeddings(
+            model_name=MINILM_MODEL,
+            model_kwargs={"device": device},
+            encode_kwargs={"batch_size": batch_size}
+        )
+        if device == "cuda":
+            # FP16 weights run the attention/FFN matmuls on tensor cores
+            embeddings.client.half()
+        # Longer chunks are truncated; attention cost grows with the square of this
+        embeddings.client.max_seq_length = self.settings.embedding_max_seq_length
+        return embeddings
+
+    @cached_property
+    def embeddings(self) -> CacheBackedEmbeddings:
+        # Chunks are keyed by content hash, so unchanged files are never re-embedded
+        base = self.base_embeddings
+        namespace = f"minilm-l6-v2-{self.settings.embedding_backend}"
+        if isinstance(base, HuggingFaceEmbeddings):
+            # Weight precision and truncation length change the vectors, so
+            # fp16/fp32 and each max_seq_length get their own cache entries
+            dtype = str(next(base.client.parameters()).dtype).removeprefix("torch.")
+            namespace += f"-{dtype}-{base.client.max_seq_length}"
+        return CacheBackedEmbeddings.from_bytes_store(
+            base,
+            LocalFileStore(self.settings.emb_cache_path),
+            namespace=namespace
+        )
+
+    @cached_property
+    def text_splitter(self) -> RecursiveCharacterTextSplitter:
+        return RecursiveCharacterTextSplitter(
+            chunk_size=self.settings.chunk_size,
+            chunk_overlap=self.settings.chunk_overlap,
             separators=["\n\n", "\n", " ", ""]
         )
-        
-        self.vector_store = None
-        self.memory = ConversationBufferMemory(
+
+    @cached_property
+    def splitters(self) -> Dict[str, TextSplitter]:
+        """Splitters keyed by file_type; anything else uses text_splitter"""
+        code = {"chunk_size": self.settings.chunk_size, "chunk_overlap": self.settings.chunk_overlap}
+        python = RecursiveCharacterTextSplitter.from_language(Language.PYTHON, **code)
+        js = RecursiveCharacterTextSplitter.from_language(Language.JS, **code)
+        ts = RecursiveCharacterTextSplitter.from_language(Language.TS, **code)
+        markdown = RecursiveCharacterTextSplitter.from_language(Language.MARKDOWN, **code)
+        # Manifests and pipelines read best whole, so give them bigger chunks
+        config = RecursiveCharacterTextSplitter(
+            chunk_size=self.settings.config_chunk_size,
+            chunk_overlap=self.settings.chunk_overlap,
+            separators=["\n\n", "\n", " ", ""]
+        )
+        return {
+            "py": python,
+            "js": js, "jsx": js,
+            "ts": ts, "tsx": ts,
+            "md": markdown,
+            "yaml": config, "yml": config, "json": config
+        }
+
+    @cached_property
+    def chroma_client(self) -> chromadb.ClientAPI:
+        return chromadb.PersistentClient(
+            path=self.settings.vector_db_path,
+            settings=ChromaSettings(anonymized_telemetry=False)
+        )
+
+    @cached_property
+    def memory(self) -> ConversationSummaryBufferMemory:
+        # Older turns are folded into a rolling summary so prompts stay bounded
+        return _SummaryBufferMemory(
+            llm=self.question_llm,
             memory_key="chat_history",
-            return_messages=True
+            output_key="answer",
+            return_messages=True,
+            max_token_limit=1024
         )
-        self.qa_chain = None
 
     async def analyze_repository(self, repo_url: str) -> Dict[str, Any]:
         """Clone and analyze a GitHub repository"""
+        collection_name = _collection_name(repo_url)
+        cached = self._repositories.get(collection_name)
+        if cached is not None:
+            vector_store, qa_chain, result, head = cached
+            # Reuse the index only while the remote has no new commits
+            if head == await asyncio.to_thread(_remote_head, repo_url):
+                self.vector_store, self.qa_chain = vector_store, qa_chain
+                return result
+        
         with tempfile.TemporaryDirectory() as temp_dir:
             try:
                 # Clone repository
-                repo = Repo.clone_from(repo_url, temp_dir)
+                repo = self._clone_repository(repo_url, temp_dir)
                 
                 # Extract files
                 documents = self._extract_files(temp_dir)
@@ -55,17 +361,14 @@ class LangChainService:
                 
                 # Create vector store
                 if documents:  # Only create if we have documents
-                    self.vector_store = Chroma.from_documents(
-                        documents=documents,
-                        embedding=self.embeddings,
-                        persist_directory=settings.vector_db_path
-                    )
+                    self.vector_store = self._build_vector_store(collection_name, documents)
                 else:
                     raise Exception("No analyzable files found in repository")
                 
                 # Create QA chain
                 self.qa_chain = ConversationalRetrievalChain.from_llm(
                     llm=self.llm,
+                    condense_question_llm=self.question_llm,
                     retriever=self.vector_store.as_retriever(),
                     memory=self.memory,
                     return_source_documents=True
@@ -74,59 +377,151 @@ class LangChainService:
                 # Analyze codebase
                 analysis = await self._analyze_codebase(documents)
                 
-                return {
+                result = {
                     "repository_url": repo_url,
                     "files_analyzed": [doc.metadata.get("source", "") for doc in documents],
                     "analysis": analysis,
                     "summary": await self._generate_summary(analysis)
                 }
+                self._repositories[collection_name] = (
+                    self.vector_store, self.qa_chain, result, repo.head.commit.hexsha
+                )
+                return result
                 
             except Exception as e:
                 raise Exception(f"Failed to analyze repository: {str(e)}")
 
+    def _clone_repository(self, repo_url: str, path: str) -> Repo:
+        """Shallow, blobless clone that only materializes files we analyze"""
+        repo = Repo.clone_from(
+            repo_url,
+            path,
+            depth=1,
+            single_branch=True,
+            no_tags=True,
+            filter="blob:none",
+            no_checkout=True
+        )
+        # Blobs are fetched on checkout, so images and vendored binaries are never downloaded
+        patterns = [f"*{suffix}" for suffix in self._SUFFIXES] + [f"{prefix}*" for prefix in self._PREFIXES]
+        patterns += [f"*{infix}*" for infix in self._INFIXES]
+        patterns += [f"!**/{skipped}/**" for skipped in sorted(self._SKIP_DIRS)]
+        repo.git.sparse_checkout("set", "--no-cone", *patterns)
+        repo.git.checkout()
+        return repo
+
+    def prune_collections(self) -> None:
+        """Drop repository collections that are not in this process's cache"""
+        # Left by an earlier run, they would never be evicted. Only safe with a
+        # single worker, which owns every collection in vector_db_path
+        for collection in self.chroma_client.list_collections():
+            if collection.name.startswith(COLLECTION_PREFIX) and collection.name not in self._repositories:
+                self._drop_collection(collection.name)
+
+    def _drop_collection(self, collection_name: str) -> None:
+        try:
+            self.chroma_client.delete_collection(collection_name)
+        except ValueError:
+            pass
+
+    def _build_vector_store(self, collection_name: str, documents: List[Document]) -> Chroma:
+        """Embed all chunks in one pass and write them to a fresh collection in large batches"""
+        # Start from an empty collection so a re-analysis never keeps stale chunks
+        self._drop_collection(collection_name)
+        collection = self.chroma_client.create_collection(collection_name, metadata=HNSW_PARAMS)
+        
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+        ids = [doc.metadata["id"] for doc in documents]
+        embeddings = self.embeddings.embed_documents(texts)
+        
+        for start in range(0, len(texts), CHROMA_BATCH_SIZE):
+            end = start + CHROMA_BATCH_SIZE
+            collection.add(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=texts[start:end],
+                metadatas=metadatas[start:end]
+            )
+        
+        return Chroma(
+            client=self.chroma_client,
+            collection_name=collection_name,
+            embedding_function=self.embeddings
+        )
+
     def _extract_files(self, repo_path: str) -> List[Document]:
         """Extract and process files from repository"""
-        documents = []
-        
-        # File patterns to include
-        include_patterns = [
-            "*.py", "*.js", "*.ts", "*.jsx", "*.tsx",
-            "*.yaml", "*.yml", "*.json", "*.md",
-            "Dockerfile*", "docker-compose*",
-            "*.tf", "*.sh", "*.env*"
-        ]
-        
+        # Collect candidate paths in one walk, then read them in parallel
+        candidates = []
         for root, dirs, files in os.walk(repo_path):
             # Skip hidden directories and common ignore patterns
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv']]
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in self._SKIP_DIRS]
             
             for file in files:
-                if any(file.endswith(pattern.replace('*', '')) for pattern in include_patterns) or \
-                   any(pattern.replace('*', '') in file for pattern in include_patterns):
-                    
+                if (
+                    file.endswith(self._SUFFIXES)
+                    or file.startswith(self._PREFIXES)
+                    or any(infix in file for infix in self._INFIXES)
+                ):
                     file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, repo_path)
-                    
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            
-                        doc = Document(
-                            page_content=content,
-                            metadata={
-                                "source": relative_path,
-                                "file_type": file.split('.')[-1] if '.' in file else 'unknown'
-                            }
-                        )
-                        documents.append(doc)
-                        
-                    except (UnicodeDecodeError, PermissionError):
-                        continue
+                    candidates.append((file_path, os.path.relpath(file_path, repo_path)))
+        
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(self._read_file, candidates)
+        
+        # Group documents by the splitter for their file type
+        by_splitter: Dict[TextSplitter, List[Document]] = {}
+        for result in results:
+            if result is None:
+                continue
+            relative_path, content = result
+            file = os.path.basename(relative_path)
+            file_type = file.split('.')[-1] if '.' in file else 'unknown'
+            splitter = self.splitters.get(file_type, self.text_splitter)
+            by_splitter.setdefault(splitter, []).append(Document(
+                page_content=content,
+                metadata={
+                    "source": relative_path,
+                    "file_type": file_type,
+                    "kind": _file_kinds(relative_path)
+                }
+            ))
         
         # Split documents
-        split_docs = self.text_splitter.split_documents(documents)
+        split_docs = []
+        for splitter, documents in by_splitter.items():
+            split_docs.extend(splitter.split_documents(documents))
         return split_docs
 
+    def _read_file(self, candidate: Tuple[str, str]) -> Optional[Tuple[str, str]]:
+        """Read one text file, returning (relative_path, content) or None if skipped"""
+        file_path, relative_path = candidate
+        try:
+            # Skip oversized files (minified bundles, generated JSON) before reading
+            size = os.stat(file_path).st_size
+            if size > self.settings.max_file_bytes:
+                return None
+            
+            with open(file_path, 'rb') as f:
+                if size > MMAP_THRESHOLD_BYTES:
+                    # Decode from the page cache directly instead of copying into bytes first
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if mm.find(b'\0', 0, BINARY_SNIFF_BYTES) != -1:
+                            return None
+                        return relative_path, str(mm, 'utf-8')
+                
+                head = f.read(BINARY_SNIFF_BYTES)
+                # A NUL byte in the first block means binary content
+                if b'\0' in head:
+                    return None
+                data = head + f.read()
+            
+            return relative_path, data.decode('utf-8')
+        except (UnicodeDecodeError, OSError, ValueError):
+            return None
+
     async def _analyze_codebase(self, documents: List[Document]) -> Dict[str, List[str]]:
         """Analyze codebase for DevOps improvements"""
         analysis = {
@@ -136,25 +531,26 @@ class LangChainService:
             "monitoring_suggestions": []
         }
         
-        # Find relevant files
-        dockerfiles = [doc for doc in documents if "dockerfile" in doc.metadata.get("source", "").lower()]
-        k8s_files = [doc for doc in documents if doc.metadata.get("source", "").endswith(('.yaml', '.yml'))]
-        ci_files = [doc for doc in documents if ".github" in doc.metadata.get("source", "")]
-        
-        # Analyze Dockerfiles
-        if dockerfiles:
-            dockerfile_analysis = await self._analyze_dockerfiles(dockerfiles)
-            analysis["dockerfile_suggestions"] = dockerfile_analysis
-        
-        # Analyze Kubernetes files
-        if k8s_files:
-            k8s_analysis = await self._analyze_kubernetes(k8s_files)
-            analysis["kubernetes_suggestions"] = k8s_analysis
+        # Find relevant files in one pass using the kinds tagged at extraction
+        buckets: Dict[str, List[Document]] = {"dockerfile": [], "k8s": [], "ci": []}
+        for doc in documents:
+            kind = doc.metadata.get("kind")
+            if kind:
+                for k in kind.split(","):
+                    buckets[k].append(doc)
+        dockerfiles, k8s_files, ci_files = buckets["dockerfile"], buckets["k8s"], buckets["ci"]
         
-        # Analyze CI/CD files
-        if ci_files:
-            cicd_analysis = await self._analyze_cicd(ci_files)
-            analysis["cicd_suggestions"] = cicd_analysis
+        # Analyze Dockerfiles, Kubernetes and CI/CD files concurrently;
+        # each analyzer returns [] for an empty file list
+        (
+            analysis["dockerfile_suggestions"],
+            analysis["kubernetes_suggestions"],
+            analysis["cicd_suggestions"]
+        ) = await asyncio.gather(
+            self._analyze_dockerfiles(dockerfiles),
+            self._analyze_kubernetes(k8s_files),
+            self._analyze_cicd(ci_files)
+        )
         
         # General monitoring suggestions
         analysis["monitoring_suggestions"] = [
@@ -171,18 +567,18 @@ class LangChainService:
         suggestions = []
         
         for doc in dockerfiles:
-            content = doc.page_content.lower()
+            hits = _find_keywords(_DOCKERFILE_KEYWORDS, doc.page_content.lower())
             
-            if "healthcheck" not in content:
+            if "healthcheck" not in hits:
                 suggestions.append("Add HEALTHCHECK instruction to Dockerfile")
             
-            if "user" not in content:
+            if "user" not in hits:
                 suggestions.append("Run container as non-root user for security")
             
-            if "multi-stage" not in content and "from" in content:
+            if "multi-stage" not in hits and "from" in hits:
                 suggestions.append("Consider using multi-stage builds to reduce image size")
             
-            if ".dockerignore" not in content:
+            if ".dockerignore" not in hits:
                 suggestions.append("Create .dockerignore file to exclude unnecessary files")
         
         return suggestions
@@ -192,18 +588,18 @@ class LangChainService:
         suggestions = []
         
         for doc in k8s_files:
-            content = doc.page_content.lower()
+            hits = _find_keywords(_KUBERNETES_KEYWORDS, doc.page_content.lower())
             
-            if "resources:" not in content:
+            if "resources:" not in hits:
                 suggestions.append("Add resource limits and requests to prevent resource starvation")
             
-            if "livenessprobe" not in content:
+            if "livenessprobe" not in hits:
                 suggestions.append("Configure liveness probe for health checking")
             
-            if "readinessprobe" not in content:
+            if "readinessprobe" not in hits:
                 suggestions.append("Configure readiness probe for traffic routing")
             
-            if "securitycontext" not in content:
+            if "securitycontext" not in hits:
                 suggestions.append("Add security context to run containers securely")
         
         return suggestions
@@ -213,18 +609,18 @@ class LangChainService:
         suggestions = []
         
         for doc in ci_files:
-            content = doc.page_content.lower()
+            hits = _find_keywords(_CICD_KEYWORDS, doc.page_content.lower())
             
-            if "cache" not in content:
+            if "cache" not in hits:
                 suggestions.append("Add caching to speed up builds")
             
-            if "test" not in content:
+            if "test" not in hits:
                 suggestions.append("Include automated testing in CI pipeline")
             
-            if "security" not in content and "scan" not in content:
+            if "security" not in hits and "scan" not in hits:
                 suggestions.append("Add security scanning to CI pipeline")
             
-            if "artifact" not in content:
+            if "artifact" not in hits:
                 suggestions.append("Configure build artifacts storage")
         
         return suggestions
@@ -245,5 +641,25 @@ class LangChainService:
         except Exception as e:
             return f"Sorry, I encountered an error: {str(e)}"
 
+    async def chat_stream(self, message: str) -> AsyncIterator[str]:
+        """Chat with the AI about the codebase, yielding answer tokens as they arrive"""
+        if not self.qa_chain:
+            yield "Please analyze a repository first before asking questions."
+            return
+        
+        handler = _AnswerStreamHandler()
+        task = asyncio.create_task(self.qa_chain.acall({"question": message}, callbacks=[handler]))
+        task.add_done_callback(lambda _: handler.done.set())
+        
+        try:
+            async for token in handler.aiter():
+                yield token
+            await task
+        except Exception as e:
+            yield f"Sorry, I encountered an error: {str(e)}"
+        finally:
+            # Stop generating if the client went away mid-stream
+            task.cancel()
+
 # Global service instance
 langchain_service = LangChainService()
\ No newline at end of file
@@ -0,0 +1,11 @@
+from typing import List, Tuple
+
+from starlette.types import Send
+
+Header = Tuple[bytes, bytes]
+
+
+async def send_response(send: Send, status: int, headers: List[Header], body: bytes) -> None:
+    """Send a complete response straight from middleware, without building a Response"""
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,110 @@
+from typing import Iterable, List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .asgi import Header, send_response
+
+ALL_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+
+
+class FastCORSMiddleware:
+    """Pure ASGI CORS middleware for a static list of allowed origins.
+
+    All response headers are computed once at startup; per request we only
+    scan the raw header list for the origin and append the prebuilt tuples
+    to the ``http.response.start`` message.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        origins: Iterable[str],
+        methods: Iterable[str] = ("*",),
+        headers: Iterable[str] = ("*",),
+        credentials: bool = False,
+        max_age: int = 600,
+    ):
+        self.app = app
+        # Compared against the raw header bytes, no per-request decode
+        self._allow_origin = frozenset(o.encode("ascii") for o in origins)
+        self._allow_all = b"*" in self._allow_origin
+
+        methods = list(methods)
+        headers = list(headers)
+        if "*" in methods:
+            methods = list(ALL_METHODS)
+
+        # Headers added to every CORS response (simple and preflight)
+        self._simple_headers: List[Header] = [(b"vary", b"Origin")]
+        if credentials:
+            self._simple_headers.append((b"access-control-allow-credentials", b"true"))
+
+        # Wildcard headers are answered by echoing what the browser asked for
+        self._echo_headers = "*" in headers
+        self._preflight_headers: List[Header] = [
+            (b"access-control-allow-methods", ", ".join(methods).encode()),
+            (b"access-control-max-age", str(max_age).encode()),
+        ]
+        if not self._echo_headers:
+            self._preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(headers).encode())
+            )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin: Optional[bytes] = None
+        request_method: Optional[bytes] = None
+        request_headers: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        allowed = self._allow_all or origin in self._allow_origin
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(origin, allowed, request_headers, send)
+            return
+
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin), *self._simple_headers]
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Build a new list: cached Response objects share their raw_headers
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(
+        self, origin: bytes, allowed: bool, request_headers: Optional[bytes], send: Send
+    ) -> None:
+        if not allowed:
+            await send_response(
+                send, 400, [(b"content-type", b"text/plain; charset=utf-8")], b"Disallowed CORS origin"
+            )
+            return
+
+        headers = [
+            (b"access-control-allow-origin", origin),
+            *self._simple_headers,
+            *self._preflight_headers,
+        ]
+        if self._echo_headers and request_headers:
+            headers.append((b"access-control-allow-headers", request_headers))
+
+        await send_response(send, 204, headers, b"")
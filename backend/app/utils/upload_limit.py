@@ -0,0 +1,59 @@
+from typing import Iterable, Optional
+
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .asgi import send_response
+
+_JSON = [(b"content-type", b"application/json")]
+
+
+class UploadLimitMiddleware:
+    """Pure ASGI request body limit for a set of upload paths.
+
+    Runs before the route parses its form, so a declared Content-Length over
+    the limit is answered with 413 without reading the body, and chunked
+    bodies are cut off as soon as the running byte count passes it.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str], max_bytes: int):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = value
+                break
+
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                declared = -1
+            if declared < 0:
+                await send_response(send, 400, _JSON, b'{"detail":"Invalid Content-Length"}')
+                return
+            if declared > self.max_bytes:
+                await send_response(send, 413, _JSON, b'{"detail":"Upload too large"}')
+                return
+
+        received = 0
+
+        async def receive_limited() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside the form parser; FastAPI passes HTTPException through
+                    raise HTTPException(status_code=413, detail="Upload too large")
+            return message
+
+        await self.app(scope, receive_limited, send)
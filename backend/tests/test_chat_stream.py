@@ -0,0 +1,52 @@
+import asyncio
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from langchain.chains import ConversationalRetrievalChain
+from langchain.memory import ConversationBufferMemory
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.retrievers import BaseRetriever
+
+from app.services.langchain_service import LangChainService, _StreamingChatGoogleGenerativeAI
+
+
+class _Retriever(BaseRetriever):
+    def _get_relevant_documents(self, query, *, run_manager):
+        return [Document(page_content="FROM python:3.11")]
+
+
+def test_chat_stream_yields_tokens_before_chain_finishes():
+    async def run():
+        first_token_seen = asyncio.Event()
+
+        class _Model(_StreamingChatGoogleGenerativeAI):
+            async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+                for text in ("Add a ", "HEALTHCHECK"):
+                    if run_manager:
+                        await run_manager.on_llm_new_token(text)
+                    yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+                    # The answer only completes once the caller has received a token
+                    await first_token_seen.wait()
+
+        service = LangChainService()
+        service.qa_chain = ConversationalRetrievalChain.from_llm(
+            llm=_Model(model="gemini-pro", google_api_key="test-key"),
+            retriever=_Retriever(),
+            memory=ConversationBufferMemory(
+                memory_key="chat_history", output_key="answer", return_messages=True
+            )
+        )
+
+        stream = service.chat_stream("How do I improve my Dockerfile?")
+        try:
+            tokens = [await asyncio.wait_for(stream.__anext__(), timeout=5)]
+            first_token_seen.set()
+            tokens += [token async for token in stream]
+        finally:
+            await stream.aclose()
+        return tokens
+
+    assert asyncio.run(run()) == ["Add a ", "HEALTHCHECK"]
@@ -0,0 +1,18 @@
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from app.config import Settings
+from app.services.langchain_service import LangChainService
+
+
+def test_prune_collections_keeps_cached_and_foreign_collections(tmp_path):
+    service = LangChainService(Settings(gemini_api_key="test-key", vector_db_path=str(tmp_path)))
+    client = service.chroma_client
+    for name in ("repo_stale", "repo_live", "other"):
+        client.create_collection(name)
+    service._repositories["repo_live"] = (None, None, {}, "sha")
+
+    service.prune_collections()
+
+    assert sorted(c.name for c in client.list_collections()) == ["other", "repo_live"]
@@ -0,0 +1,99 @@
+import asyncio
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import suggestions
+from app.utils.cors import FastCORSMiddleware
+
+ALLOWED = "http://localhost:5173"
+OTHER_ALLOWED = "http://localhost:3000"
+DISALLOWED = "http://evil.example"
+
+app = FastAPI()
+app.add_middleware(
+    FastCORSMiddleware,
+    origins=[ALLOWED, OTHER_ALLOWED],
+    credentials=True,
+    max_age=86400,
+)
+app.include_router(suggestions.router)
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+client = TestClient(app)
+
+
+def test_preflight_from_allowed_origin():
+    response = client.options("/ping", headers={
+        "origin": ALLOWED,
+        "access-control-request-method": "POST",
+        "access-control-request-headers": "content-type, x-trace",
+    })
+    assert response.status_code == 204
+    assert response.headers["access-control-allow-origin"] == ALLOWED
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-max-age"] == "86400"
+    assert response.headers["access-control-allow-headers"] == "content-type, x-trace"
+    assert "POST" in response.headers["access-control-allow-methods"]
+
+
+def test_preflight_from_disallowed_origin_is_rejected():
+    response = client.options("/ping", headers={
+        "origin": DISALLOWED,
+        "access-control-request-method": "POST",
+    })
+    assert response.status_code == 400
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_simple_request_from_allowed_origin_gets_cors_headers():
+    response = client.get("/ping", headers={"origin": ALLOWED})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == ALLOWED
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_simple_request_from_disallowed_origin_gets_no_cors_headers():
+    response = client.get("/ping", headers={"origin": DISALLOWED})
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+    assert "access-control-allow-credentials" not in response.headers
+
+
+def test_request_without_origin_passes_through():
+    response = client.get("/ping")
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_non_http_scope_passes_through():
+    calls = []
+
+    async def inner(scope, receive, send):
+        calls.append(scope["type"])
+
+    middleware = FastCORSMiddleware(inner, origins=[ALLOWED])
+    asyncio.run(middleware({"type": "lifespan"}, None, None))
+    assert calls == ["lifespan"]
+
+
+def test_cached_template_response_headers_are_not_mutated():
+    first = client.post("/suggestions/generate-tests", json={"type": "selenium"}, headers={"origin": ALLOWED})
+    second = client.post(
+        "/suggestions/generate-tests", json={"type": "selenium"}, headers={"origin": OTHER_ALLOWED}
+    )
+    assert first.headers.get_list("access-control-allow-origin") == [ALLOWED]
+    assert second.headers.get_list("access-control-allow-origin") == [OTHER_ALLOWED]
+
+    cached = suggestions._template_response("tests", "selenium")
+    assert not any(name.startswith(b"access-control-") for name, _ in cached.raw_headers)
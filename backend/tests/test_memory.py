@@ -0,0 +1,36 @@
+import asyncio
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from langchain_community.llms.fake import FakeListLLM
+
+from app.services.langchain_service import _SummaryBufferMemory
+
+
+class _NoTokenCountLLM(FakeListLLM):
+    def get_num_tokens(self, text: str) -> int:
+        raise AssertionError("pruning must not call the model's tokenizer")
+
+
+def test_prune_summarizes_in_background_without_counting_tokens_remotely():
+    async def run():
+        memory = _SummaryBufferMemory(
+            llm=_NoTokenCountLLM(responses=["user asked about Dockerfiles"]),
+            memory_key="chat_history",
+            output_key="answer",
+            return_messages=True,
+            max_token_limit=50
+        )
+        for turn in range(3):
+            memory.save_context({"question": f"question {turn} " * 20}, {"answer": "answer " * 20})
+
+        # Pruned turns stay visible until their summary lands
+        assert len(memory.load_memory_variables({})["chat_history"]) == 6
+        await memory.summary_task
+        return memory
+
+    memory = asyncio.run(run())
+    assert memory.moving_summary_buffer == "user asked about Dockerfiles"
+    assert memory.pending_messages == []
+    assert len(memory.chat_memory.messages) < 6
@@ -0,0 +1,44 @@
+from typing import List
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.utils.upload_limit import UploadLimitMiddleware
+
+app = FastAPI()
+app.add_middleware(UploadLimitMiddleware, paths=["/upload"], max_bytes=1024)
+
+
+@app.post("/upload")
+async def upload(files: List[UploadFile] = File(...)):
+    return {"sizes": [len(await f.read()) for f in files]}
+
+
+client = TestClient(app)
+
+
+def test_declared_oversize_is_rejected_before_the_body_is_read():
+    response = client.post("/upload", content=b"x" * 10, headers={"content-length": "4096"})
+    assert response.status_code == 413
+
+
+def test_malformed_content_length_is_a_bad_request():
+    response = client.post("/upload", content=b"x", headers={"content-length": "abc"})
+    assert response.status_code == 400
+
+
+def test_chunked_body_is_cut_off_at_the_limit():
+    def body():
+        for _ in range(8):
+            yield b"x" * 512
+
+    response = client.post(
+        "/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"}
+    )
+    assert response.status_code == 413
+
+
+def test_upload_within_the_limit_is_accepted():
+    response = client.post("/upload", files=[("files", ("Dockerfile", b"FROM python:3.11"))])
+    assert response.status_code == 200
+    assert response.json() == {"sizes": [16]}